@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the adws workflows.
+Usage:
+  adws/adws.py <command> [args...]     # Run a workflow
+  adws/adws.py --wait <command> ...    # Queue it, follow its log, exit with its code
+  adws/adws.py --local <command> ...   # Run in this process even if a server is up
+  adws/adws.py status [job id]         # Show queued/running/finished jobs
+  adws/adws.py status <job id> --wait  # Follow a job's log and exit with its code
+  adws/adws.py server start|stop       # Start or stop the warm background server
+
+Run it directly rather than through `uv run`: it only needs the standard
+library, and skipping uv's environment resolution is what keeps client
+calls fast. To get a plain `adws` command, symlink it onto your PATH:
+
+  ln -s "$PWD/adws/adws.py" ~/.local/bin/adws
+
+Commands:
+  feature    Plan a feature                  (feature.py)
+  implement  Implement a spec                (implement.py)
+  bug        Create a branch and fix a bug   (bug.py)
+  chore      Create a branch and do a chore  (chore.py)
+  build      Plan and implement a feature    (build_feature.py)
+  commit     Commit and push the branch      (commit.py)
+  pr         Create a pull request           (create_pr.py)
+
+Without a running server the workflow runs here, exactly like the
+individual script. With a server running (see server.py) the workflow is
+queued there and this client returns immediately with the job id and log
+file, always exiting 0. Use --wait when chaining commands, e.g.
+
+  adws/adws.py --wait build 'Add dark mode' && adws/adws.py --wait commit 'Add dark mode'
+
+otherwise the second command runs even if the first job fails. Queued jobs run in this directory and honour this shell's
+ADWS_TRACE; the server must be serving the same ADWS_PROJECT_ROOT.
+Subcommand modules are only imported when they are run.
+"""
+
+import importlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import tracing
+from common import PROJECT_ROOT, RUNTIME_DIR, SOCKET_PATH, SUBCOMMANDS, check_runtime_dir, check_socket, open_private
+from fanout import parse_args
+
+
+def usage():
+    print(__doc__.strip())
+    sys.exit(1)
+
+
+def request(payload):
+    """Send a request to the server and return its response, or None if it is not running."""
+    error = check_socket()
+    if error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(SOCKET_PATH))
+            conn.sendall((json.dumps(payload) + "\n").encode())
+            return json.loads(conn.makefile().readline())
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error: No valid reply from adws server on {SOCKET_PATH} - {e}")
+        sys.exit(1)
+
+
+def print_job(job):
+    """Print one job as a status line."""
+    exit_code = "" if job["exit_code"] is None else f" (exit {job['exit_code']})"
+    print(f"  #{job['id']:<4} {job['state']:<8}{exit_code} {job['command']} {' '.join(job['argv'])}")
+    print(f"        submitted {job['submitted']}  log: {job['log']}")
+
+
+def check_args(command, args):
+    """Exit with a usage error for arguments the workflow would reject.
+
+    Catches these before a job is queued rather than in its log.
+    """
+    if command == "pr":
+        return
+
+    words = parse_args(args)[0] if command in ("chore", "bug") else args
+    if not words:
+        print(f"Usage: adws/adws.py {command} <description>")
+        sys.exit(1)
+
+
+def submit(command, args):
+    """Queue a workflow on the server, or return None if no server is running."""
+    trace = os.environ.get(tracing.TRACE_ENV)
+    return request({
+        "op": "run",
+        "command": command,
+        "argv": args,
+        "cwd": os.getcwd(),
+        "project_root": str(PROJECT_ROOT),
+        "trace": str(Path(trace).expanduser().resolve()) if trace else None,
+    })
+
+
+def job_status(job_id):
+    """Return the server's current record for a job, exiting on any error."""
+    response = request({"op": "status", "job": job_id})
+    if response is None:
+        print("Error: adws server stopped while waiting for the job.")
+        sys.exit(1)
+    if not response["ok"]:
+        print(f"Error: {response['error']}")
+        sys.exit(1)
+    return response["job"]
+
+
+def wait_for(job):
+    """Follow a job's log until it finishes, then exit with its exit code."""
+    log = None
+    try:
+        while True:
+            finished = job["state"] in ("done", "failed")
+            if log is None and Path(job["log"]).exists():
+                log = open(job["log"])
+            if log is not None:
+                sys.stdout.write(log.read())
+                sys.stdout.flush()
+            if finished:
+                break
+            time.sleep(0.2)
+            job = job_status(job["id"])
+    finally:
+        if log is not None:
+            log.close()
+
+    print(f"\nJob #{job['id']} {job['state']} (exit {job['exit_code']})")
+    sys.exit(job["exit_code"])
+
+
+def status(args):
+    wait = "--wait" in args
+    args = [arg for arg in args if arg != "--wait"]
+    if wait and not args:
+        print("Error: status --wait needs a job id")
+        sys.exit(1)
+
+    payload = {"op": "status"}
+    if args:
+        try:
+            payload["job"] = int(args[0])
+        except ValueError:
+            print(f"Error: Job id must be a number, got '{args[0]}'")
+            sys.exit(1)
+
+    response = request(payload)
+    if response is None:
+        print("adws server is not running.")
+        sys.exit(1)
+    if not response["ok"]:
+        print(f"Error: {response['error']}")
+        sys.exit(1)
+
+    if wait:
+        wait_for(response["job"])
+
+    jobs = [response["job"]] if "job" in response else response["jobs"]
+    if not jobs:
+        print("No jobs submitted.")
+    for job in jobs:
+        print_job(job)
+
+
+def start_server():
+    error = check_runtime_dir()
+    if error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    if request({"op": "status"}) is not None:
+        print(f"adws server already running on {SOCKET_PATH}")
+        return
+
+    server_log = RUNTIME_DIR / "server.log"
+    with open_private(server_log, append=True) as log:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve().with_name("server.py"))],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True
+        )
+
+    # Wait for the socket to come up
+    for _ in range(100):
+        if request({"op": "status"}) is not None:
+            print(f"adws server started on {SOCKET_PATH}")
+            print(f"Server log: {server_log}")
+            return
+        time.sleep(0.05)
+
+    print(f"Error: adws server did not start. See {server_log}")
+    sys.exit(1)
+
+
+def stop_server():
+    response = request({"op": "stop"})
+    if response is None:
+        print("adws server is not running.")
+        return
+    if not response["ok"]:
+        print(f"Error: {response['error']}")
+        sys.exit(1)
+    print("adws server stopped.")
+
+
+def main():
+    args = sys.argv[1:]
+    local = False
+    wait = False
+    while args and args[0] in ("--local", "--wait"):
+        local = local or args[0] == "--local"
+        wait = wait or args[0] == "--wait"
+        args = args[1:]
+
+    if not args:
+        usage()
+
+    command, args = args[0], args[1:]
+
+    if command == "status":
+        status(args)
+    elif command == "server":
+        if args == ["start"]:
+            start_server()
+        elif args == ["stop"]:
+            stop_server()
+        else:
+            usage()
+    elif command in SUBCOMMANDS:
+        check_args(command, args)
+        response = None if local else submit(command, args)
+        if response is None:
+            # No server: run the workflow in this process
+            importlib.import_module(SUBCOMMANDS[command]).main(args)
+        elif not response["ok"]:
+            print(f"Error: {response['error']}")
+            sys.exit(1)
+        else:
+            job = response["job"]
+            print(f"Queued job #{job['id']}: {command} {' '.join(args)}")
+            print(f"Log: {job['log']}")
+            if wait:
+                wait_for(job)
+            print(f"Check progress with: adws/adws.py status {job['id']}")
+    else:
+        print(f"Error: Unknown command '{command}'")
+        usage()
+
+
+if __name__ == "__main__":
+    main()
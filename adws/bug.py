@@ -2,47 +2,56 @@
 """
 Run claude with /bug command in the pyramid-tools project.
 Usage: uv run bug.py <your bug description>
+       uv run bug.py --repo <path> [--repo <path> ...] [--jobs N] <your bug description>
+
+With one or more --repo options the same bug runs across every listed
+repository concurrently (at most N at a time, default 4) instead of the
+default checkout.
 """
 
-import subprocess
 import sys
 
+import tracing
+from common import run_command
+from fanout import fan_out, parse_args, print_summary
 
-def run_command(command, description):
-    """Run a command and return success status."""
-    print(f"\n{'=' * 80}")
-    print(f"{description}")
-    print('=' * 80)
 
-    try:
-        result = subprocess.run(
-            command,
-            cwd="/Users/sbolster/projects/corporate/pyramid-tools",
-            check=True
-        )
-        return result.returncode == 0
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Command failed with return code {e.returncode}")
-        return False
-    except FileNotFoundError as e:
-        print(f"Error: Command not found - {e}")
-        return False
-
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: uv run bug.py <bug description>")
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tracing.start("bug.py", argv=argv)
+
+    words, repos, jobs = parse_args(argv)
+
+    if not words:
+        print("Usage: uv run bug.py [--repo <path> ...] [--jobs N] <bug description>")
         print("Example: uv run bug.py 'Fix PDF preview not loading'")
         sys.exit(1)
 
-    # Join all arguments after the script name into a single bug description
-    bug_input = " ".join(sys.argv[1:])
+    # Join all remaining arguments into a single bug description
+    bug_input = " ".join(words)
+
+    if repos:
+        print(f"Running bug across {len(repos)} repositories: {bug_input}")
+        results = fan_out(
+            repos,
+            [
+                (["claude", "-p", f"/create-branch bug {bug_input}"], "Creating bug branch..."),
+                (["claude", "-p", f"/bug {bug_input}"], "Running bug planning and fix..."),
+            ],
+            jobs
+        )
+        if not print_summary(results):
+            sys.exit(1)
+        return
 
     # Step 1: Create git branch
     print(f"Step 1: Creating git branch for bug fix: {bug_input}")
-    success = run_command(
+    _, success = run_command(
         ["claude", "-p", f"/create-branch bug {bug_input}"],
-        "Creating bug fix branch..."
+        "Creating bug fix branch...",
+        capture=False
     )
 
     if not success:
@@ -51,9 +60,10 @@ def main():
 
     # Step 2: Run bug command
     print(f"\nStep 2: Planning and fixing bug: {bug_input}")
-    success = run_command(
+    _, success = run_command(
         ["claude", "-p", f"/bug {bug_input}"],
-        "Running bug planning and fix..."
+        "Running bug planning and fix...",
+        capture=False
     )
 
     if not success:
@@ -7,43 +7,20 @@ Orchestrate feature planning and implementation.
 4. Saves all output to a log file
 
 Usage: uv run build_feature.py <feature description>
+
+Set ADWS_TRACE=<file> to also record a Chrome/Perfetto trace of the run
+(see tracing.py).
 """
 
-import subprocess
 import sys
 import re
 from datetime import datetime
-from pathlib import Path
-
-
-def run_command(command, description):
-    """Run a command and capture its output."""
-    print(f"\n{'=' * 80}")
-    print(f"{description}")
-    print('=' * 80)
 
-    try:
-        result = subprocess.run(
-            command,
-            cwd="/Users/sbolster/projects/corporate/pyramid-tools",
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        output = result.stdout + result.stderr
-        print(output)
-        return output, True
-    except subprocess.CalledProcessError as e:
-        output = e.stdout + e.stderr
-        print(output)
-        print(f"Error: Command failed with return code {e.returncode}")
-        return output, False
-    except FileNotFoundError as e:
-        error_msg = f"Error: Command not found - {e}"
-        print(error_msg)
-        return error_msg, False
+import tracing
+from common import SPECS_DIR, run_command
 
 
+@tracing.traced()
 def extract_spec_file(output):
     """Extract the spec file path from feature command output."""
     # Look for pattern: ## Feature Plan Created: `specs/001-dark-mode-toggle.md`
@@ -68,18 +45,29 @@ def extract_spec_file(output):
     return None
 
 
-def main():
-    if len(sys.argv) < 2:
+@tracing.traced()
+def write_log(log_file, all_output):
+    """Write the collected build output to the log file."""
+    log_file.write_text("\n".join(all_output))
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tracing.start("build_feature.py", argv=argv)
+
+    if not argv:
         print("Usage: uv run build_feature.py <feature description>")
         print("Example: uv run build_feature.py 'Add dark mode toggle to homepage'")
         sys.exit(1)
 
     # Get feature description
-    feature_description = " ".join(sys.argv[1:])
+    feature_description = " ".join(argv)
 
     # Create log file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = Path("/Users/sbolster/projects/corporate/pyramid-tools/specs") / f"build_log_{timestamp}.md"
+    log_file = SPECS_DIR / f"build_log_{timestamp}.md"
 
     all_output = []
     all_output.append(f"# Feature Build Log")
@@ -101,7 +89,7 @@ def main():
         error_msg = "Failed to create git branch. Aborting."
         print(f"\n{error_msg}")
         all_output.append(f"\n**ERROR:** {error_msg}\n")
-        log_file.write_text("\n".join(all_output))
+        write_log(log_file, all_output)
         print(f"\nLog saved to: {log_file}")
         sys.exit(1)
 
@@ -119,7 +107,7 @@ def main():
         error_msg = "Failed to create feature plan. Aborting."
         print(f"\n{error_msg}")
         all_output.append(f"\n**ERROR:** {error_msg}\n")
-        log_file.write_text("\n".join(all_output))
+        write_log(log_file, all_output)
         print(f"\nLog saved to: {log_file}")
         sys.exit(1)
 
@@ -130,7 +118,7 @@ def main():
         error_msg = "Could not find spec file path in feature output. Aborting."
         print(f"\n{error_msg}")
         all_output.append(f"\n**ERROR:** {error_msg}\n")
-        log_file.write_text("\n".join(all_output))
+        write_log(log_file, all_output)
         print(f"\nLog saved to: {log_file}")
         sys.exit(1)
 
@@ -158,7 +146,7 @@ def main():
     all_output.append(f"- Spec File: {spec_file}")
     all_output.append(f"- Status: {'Completed' if success else 'Completed with errors'}")
 
-    log_file.write_text("\n".join(all_output))
+    write_log(log_file, all_output)
 
     print(f"\n{'=' * 80}")
     print(f"Build complete!")
@@ -2,47 +2,56 @@
 """
 Run claude with /chore command in the pyramid-tools project.
 Usage: uv run chore.py <your chore description>
+       uv run chore.py --repo <path> [--repo <path> ...] [--jobs N] <your chore description>
+
+With one or more --repo options the same chore runs across every listed
+repository concurrently (at most N at a time, default 4) instead of the
+default checkout.
 """
 
-import subprocess
 import sys
 
+import tracing
+from common import run_command
+from fanout import fan_out, parse_args, print_summary
 
-def run_command(command, description):
-    """Run a command and return success status."""
-    print(f"\n{'=' * 80}")
-    print(f"{description}")
-    print('=' * 80)
 
-    try:
-        result = subprocess.run(
-            command,
-            cwd="/Users/sbolster/projects/corporate/pyramid-tools",
-            check=True
-        )
-        return result.returncode == 0
-    except subprocess.CalledProcessError as e:
-        print(f"Error: Command failed with return code {e.returncode}")
-        return False
-    except FileNotFoundError as e:
-        print(f"Error: Command not found - {e}")
-        return False
-
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: uv run chore.py <chore description>")
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tracing.start("chore.py", argv=argv)
+
+    words, repos, jobs = parse_args(argv)
+
+    if not words:
+        print("Usage: uv run chore.py [--repo <path> ...] [--jobs N] <chore description>")
         print("Example: uv run chore.py 'Update dependencies and fix linting issues'")
         sys.exit(1)
 
-    # Join all arguments after the script name into a single chore description
-    chore_input = " ".join(sys.argv[1:])
+    # Join all remaining arguments into a single chore description
+    chore_input = " ".join(words)
+
+    if repos:
+        print(f"Running chore across {len(repos)} repositories: {chore_input}")
+        results = fan_out(
+            repos,
+            [
+                (["claude", "-p", f"/create-branch chore {chore_input}"], "Creating chore branch..."),
+                (["claude", "-p", f"/chore {chore_input}"], "Running chore planning and execution..."),
+            ],
+            jobs
+        )
+        if not print_summary(results):
+            sys.exit(1)
+        return
 
     # Step 1: Create git branch
     print(f"Step 1: Creating git branch for chore: {chore_input}")
-    success = run_command(
+    _, success = run_command(
         ["claude", "-p", f"/create-branch chore {chore_input}"],
-        "Creating chore branch..."
+        "Creating chore branch...",
+        capture=False
     )
 
     if not success:
@@ -51,9 +60,10 @@ def main():
 
     # Step 2: Run chore command
     print(f"\nStep 2: Planning and executing chore: {chore_input}")
-    success = run_command(
+    _, success = run_command(
         ["claude", "-p", f"/chore {chore_input}"],
-        "Running chore planning and execution..."
+        "Running chore planning and execution...",
+        capture=False
     )
 
     if not success:
@@ -4,59 +4,33 @@ Commit and push changes for the current branch.
 Usage: uv run commit.py <commit message>
 """
 
-import subprocess
 import sys
 
+import tracing
+from common import current_branch as get_current_branch, run_command
 
-def run_command(command, description):
-    """Run a command and return output and success status."""
-    print(f"\n{'=' * 80}")
-    print(f"{description}")
-    print('=' * 80)
 
-    try:
-        result = subprocess.run(
-            command,
-            cwd="/Users/sbolster/projects/corporate/pyramid-tools",
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        output = result.stdout + result.stderr
-        print(output)
-        return output, True
-    except subprocess.CalledProcessError as e:
-        output = e.stdout + e.stderr
-        print(output)
-        print(f"Error: Command failed with return code {e.returncode}")
-        return output, False
-    except FileNotFoundError as e:
-        error_msg = f"Error: Command not found - {e}"
-        print(error_msg)
-        return error_msg, False
-
-
-def main():
-    if len(sys.argv) < 2:
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tracing.start("commit.py", argv=argv)
+
+    if not argv:
         print("Usage: uv run commit.py <commit message>")
         print("Example: uv run commit.py 'Add screenshot annotator feature'")
         sys.exit(1)
 
     # Get commit message
-    commit_message = " ".join(sys.argv[1:])
+    commit_message = " ".join(argv)
 
     # Get current branch
-    branch_output, success = run_command(
-        ["git", "branch", "--show-current"],
-        "Getting current branch..."
-    )
+    current_branch = get_current_branch()
 
-    if not success:
+    if current_branch is None:
         print("\nFailed to get current branch. Aborting.")
         sys.exit(1)
 
-    current_branch = branch_output.strip()
-
     if not current_branch or current_branch == "master":
         print(f"\nError: Cannot commit on branch '{current_branch}'.")
         print("Please create a feature/chore/bug branch first.")
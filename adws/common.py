@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the adws workflow scripts.
+
+Holds the project configuration, the run_command helper every script
+uses, and small caches (spec index, current git branch) that let a warm
+adws server reuse state between jobs. The caches check file modification
+times, so they stay correct when specs are added or the branch changes.
+"""
+
+import os
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+import tracing
+
+PROJECT_ROOT = Path(os.environ.get(
+    "ADWS_PROJECT_ROOT",
+    "/Users/sbolster/projects/corporate/pyramid-tools"
+))
+SPECS_DIR = PROJECT_ROOT / "specs"
+# Prefer the per-user runtime directory the session already provides
+RUNTIME_DIR = Path(os.environ.get("ADWS_RUNTIME_DIR") or (
+    Path(os.environ["XDG_RUNTIME_DIR"]) / "adws"
+    if os.environ.get("XDG_RUNTIME_DIR")
+    else f"/tmp/adws-{os.getuid()}"
+))
+SOCKET_PATH = Path(os.environ.get("ADWS_SOCKET", RUNTIME_DIR / "adws.sock"))
+
+# adws subcommand -> module implementing it (imported only when used)
+SUBCOMMANDS = {
+    "feature": "feature",
+    "implement": "implement",
+    "bug": "bug",
+    "chore": "chore",
+    "build": "build_feature",
+    "commit": "commit",
+    "pr": "create_pr",
+}
+
+_spec_index = {"mtime": None, "files": []}
+_branch = {"mtime": None, "name": None}
+
+
+def check_runtime_dir():
+    """Create RUNTIME_DIR private to this user, or explain why it is unsafe.
+
+    Returns None when the directory is a real directory owned by us with
+    mode 0700, otherwise an error message. Job logs and the server socket
+    live here, so an existing directory is never loosened or reused.
+    """
+    try:
+        RUNTIME_DIR.mkdir(mode=0o700, parents=True)
+    except FileExistsError:
+        pass
+    except OSError as e:
+        return f"Could not create runtime directory {RUNTIME_DIR} - {e}"
+
+    return _check_private_dir(RUNTIME_DIR)
+
+
+def _check_private_dir(path):
+    """Return an error unless path is a real directory we own with mode 0700."""
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        return f"Runtime directory {path} is not a directory"
+    if st.st_uid != os.getuid():
+        return f"Runtime directory {path} is owned by another user"
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        return f"Runtime directory {path} must have mode 0700, has {oct(stat.S_IMODE(st.st_mode))}"
+    return None
+
+
+def check_socket():
+    """Explain why SOCKET_PATH is not safe to connect to, or return None.
+
+    The socket and the directory holding it must belong to us, so job
+    descriptions are never sent to (or replies taken from) another user's
+    server. A socket or directory that does not exist yet is fine: there
+    is simply no server to talk to.
+    """
+    parent = SOCKET_PATH.parent
+    try:
+        if parent == RUNTIME_DIR:
+            error = _check_private_dir(parent)
+        else:
+            st = os.lstat(parent)
+            if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o022:
+                error = f"Socket directory {parent} must be ours and not writable by others"
+            else:
+                error = None
+        if error:
+            return error
+
+        st = os.lstat(SOCKET_PATH)
+    except FileNotFoundError:
+        return None
+
+    if not stat.S_ISSOCK(st.st_mode):
+        return f"{SOCKET_PATH} is not a socket"
+    if st.st_uid != os.getuid():
+        return f"Socket {SOCKET_PATH} is owned by another user"
+    return None
+
+
+def open_private(path, append=False):
+    """Open a file for writing with mode 0600 without following symlinks.
+
+    Without append the file must not already exist.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW
+    flags |= os.O_APPEND if append else os.O_EXCL
+    return os.fdopen(os.open(path, flags, 0o600), "a" if append else "w")
+
+
+def output_stream(stream):
+    """Return a stream a child process can write to, or None to inherit."""
+    try:
+        stream.flush()
+        stream.fileno()
+        return stream
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def run_command(command, description, capture=True):
+    """Run a command in the project and return (output, success).
+
+    With capture=False the command's output goes straight to our stdout
+    and stderr and the returned output is empty.
+    """
+    print(f"\n{'=' * 80}")
+    print(f"{description}")
+    print('=' * 80)
+
+    with tracing.span(description):
+        try:
+            if capture:
+                result = tracing.run(
+                    command,
+                    cwd=PROJECT_ROOT,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                output = result.stdout + result.stderr
+                print(output)
+                return output, True
+            else:
+                tracing.run(
+                    command,
+                    cwd=PROJECT_ROOT,
+                    stdout=output_stream(sys.stdout),
+                    stderr=output_stream(sys.stderr),
+                    check=True
+                )
+                return "", True
+        except subprocess.CalledProcessError as e:
+            output = ""
+            if capture:
+                output = e.stdout + e.stderr
+                print(output)
+            print(f"Error: Command failed with return code {e.returncode}")
+            return output, False
+        except FileNotFoundError as e:
+            error_msg = f"Error: Command not found - {e}"
+            print(error_msg)
+            return error_msg, False
+
+
+def spec_index():
+    """Return the sorted spec files, re-reading the directory only when it changes."""
+    try:
+        mtime = SPECS_DIR.stat().st_mtime_ns
+    except OSError:
+        return []
+
+    if _spec_index["mtime"] != mtime:
+        with tracing.span("spec_index", "orchestrator"):
+            _spec_index["files"] = sorted(SPECS_DIR.glob("*.md"))
+            _spec_index["mtime"] = mtime
+
+    return _spec_index["files"]
+
+
+def current_branch():
+    """Return the checked-out branch name, or None if it cannot be determined.
+
+    The result is cached until .git/HEAD changes.
+    """
+    head = PROJECT_ROOT / ".git" / "HEAD"
+    try:
+        mtime = head.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if mtime is None or _branch["mtime"] != mtime:
+        output, success = run_command(
+            ["git", "branch", "--show-current"],
+            "Getting current branch..."
+        )
+        if not success:
+            return None
+        _branch["name"] = output.strip()
+        _branch["mtime"] = mtime
+
+    return _branch["name"]
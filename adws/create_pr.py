@@ -7,47 +7,11 @@ Usage:
   uv run create_pr.py --draft                   # Create as draft PR
 """
 
-import subprocess
 import sys
 import re
-from pathlib import Path
 
-
-def run_command(command, description, capture=True):
-    """Run a command and return output and success status."""
-    print(f"\n{'=' * 80}")
-    print(f"{description}")
-    print('=' * 80)
-
-    try:
-        if capture:
-            result = subprocess.run(
-                command,
-                cwd="/Users/sbolster/projects/corporate/pyramid-tools",
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            output = result.stdout + result.stderr
-            print(output)
-            return output, True
-        else:
-            result = subprocess.run(
-                command,
-                cwd="/Users/sbolster/projects/corporate/pyramid-tools",
-                check=True
-            )
-            return "", True
-    except subprocess.CalledProcessError as e:
-        if capture:
-            output = e.stdout + e.stderr
-            print(output)
-        print(f"Error: Command failed with return code {e.returncode}")
-        return "", False
-    except FileNotFoundError as e:
-        error_msg = f"Error: Command not found - {e}"
-        print(error_msg)
-        return error_msg, False
+import tracing
+from common import PROJECT_ROOT, current_branch as get_current_branch, run_command, spec_index
 
 
 def slugify_to_title(branch_name):
@@ -71,47 +35,43 @@ def get_branch_type(branch_name):
     return 'other'
 
 
+@tracing.traced()
 def find_related_spec(branch_name):
     """Find a spec file related to the branch."""
-    specs_dir = Path("/Users/sbolster/projects/corporate/pyramid-tools/specs")
-    if not specs_dir.exists():
-        return None
-
     # Get the branch name without prefix
     clean_name = re.sub(r'^(feature|chore|bug)/', '', branch_name)
 
     # Look for spec files that match the branch name
-    spec_files = list(specs_dir.glob("*.md"))
-    for spec_file in spec_files:
+    for spec_file in spec_index():
         if clean_name.replace('-', ' ') in spec_file.stem.lower().replace('-', ' '):
             return spec_file
 
     return None
 
 
-def main():
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tracing.start("create_pr.py", argv=argv)
+
     # Parse arguments
     custom_title = None
     is_draft = False
 
-    for arg in sys.argv[1:]:
+    for arg in argv:
         if arg == "--draft":
             is_draft = True
         else:
             custom_title = arg if not custom_title else f"{custom_title} {arg}"
 
     # Get current branch
-    branch_output, success = run_command(
-        ["git", "branch", "--show-current"],
-        "Getting current branch..."
-    )
+    current_branch = get_current_branch()
 
-    if not success:
+    if current_branch is None:
         print("\nFailed to get current branch. Aborting.")
         sys.exit(1)
 
-    current_branch = branch_output.strip()
-
     if not current_branch or current_branch == "master":
         print(f"\nError: Cannot create PR from branch '{current_branch}'.")
         print("Please switch to a feature/chore/bug branch first.")
@@ -150,7 +110,7 @@ def main():
 
     if spec_file:
         description_parts.append(f"### Related Spec")
-        description_parts.append(f"See `{spec_file.relative_to(Path.cwd())}` for detailed planning.")
+        description_parts.append(f"See `{spec_file.relative_to(PROJECT_ROOT)}` for detailed planning.")
         description_parts.append("")
 
     description_parts.extend([
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Run the same workflow steps across several repositories concurrently.
+Used by chore.py and bug.py when one or more --repo options are given.
+
+Each repository runs its steps in order and stops at the first failure.
+Repositories run in parallel on a bounded thread pool; output is captured
+per repository and printed as a block once that repository finishes, so
+concurrent runs never interleave on the terminal.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import tracing
+
+DEFAULT_JOBS = 4
+
+
+def run_step(command, cwd):
+    """Run a single step in a repository and return (output, returncode)."""
+    try:
+        result = tracing.run(
+            command,
+            cwd=cwd,
+            capture_output=True,
+            text=True
+        )
+        return result.stdout + result.stderr, result.returncode
+    except FileNotFoundError as e:
+        return f"Error: Command not found - {e}", 127
+    except OSError as e:
+        return f"Error: Could not run command - {e}", 126
+
+
+def run_repo(repo, steps):
+    """Run all steps in one repository, stopping at the first failure."""
+    result = {
+        "repo": str(repo),
+        "success": True,
+        "failed_step": None,
+        "output": [],
+    }
+
+    if not Path(repo).is_dir():
+        result["success"] = False
+        result["failed_step"] = "Checking repository path..."
+        result["output"].append(f"Error: Repository path not found - {repo}")
+        return result
+
+    with tracing.span(str(repo), "repo") as span_args:
+        for command, description in steps:
+            with tracing.span(description):
+                output, returncode = run_step(command, repo)
+            result["output"].append(f"--- {description}\n{output}")
+            if returncode != 0:
+                result["output"].append(f"Error: Command failed with return code {returncode}")
+                result["success"] = False
+                result["failed_step"] = description
+                break
+        span_args["success"] = result["success"]
+
+    return result
+
+
+def fan_out(repos, steps, jobs=DEFAULT_JOBS):
+    """Run steps across all repos with at most `jobs` running at once.
+
+    Duplicate repos are run once. Returns one result dict per repository,
+    in the order the repos were first given.
+    """
+    repos = list(dict.fromkeys(repos))
+    results = {}
+    workers = max(1, min(jobs, len(repos)))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_repo, repo, steps): repo for repo in repos}
+        for future in as_completed(futures):
+            repo = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    "repo": str(repo),
+                    "success": False,
+                    "failed_step": "Running workflow...",
+                    "output": [f"Error: {type(e).__name__}: {e}"],
+                }
+            results[repo] = result
+
+            status = "OK" if result["success"] else "FAILED"
+            print(f"\n{'=' * 80}")
+            print(f"[{status}] {result['repo']}")
+            print('=' * 80)
+            print("\n".join(result["output"]))
+
+    return [results[repo] for repo in repos]
+
+
+def print_summary(results):
+    """Print a per-repository summary and return True if every repo succeeded."""
+    print(f"\n{'=' * 80}")
+    print("Fan-out summary")
+    print('=' * 80)
+
+    for result in results:
+        if result["success"]:
+            print(f"  ✓ {result['repo']}")
+        else:
+            print(f"  ✗ {result['repo']} (failed at: {result['failed_step']})")
+
+    succeeded = sum(1 for result in results if result["success"])
+    print(f"\n{succeeded}/{len(results)} repositories succeeded")
+    print('=' * 80)
+
+    return succeeded == len(results)
+
+
+def parse_args(argv):
+    """Split --repo/--jobs options from the free-text description.
+
+    Repo paths are resolved and de-duplicated. A missing option value or a
+    --jobs value below 1 prints an error and exits.
+
+    Returns (description_words, repos, jobs).
+    """
+    words = []
+    repos = []
+    jobs = DEFAULT_JOBS
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("--repo", "--jobs") and i + 1 >= len(argv):
+            print(f"Error: {arg} expects a value")
+            sys.exit(1)
+        elif arg == "--repo":
+            repo = os.path.realpath(os.path.expanduser(argv[i + 1]))
+            if repo not in repos:
+                repos.append(repo)
+            i += 2
+        elif arg == "--jobs":
+            try:
+                jobs = int(argv[i + 1])
+            except ValueError:
+                print(f"Error: --jobs expects a number, got '{argv[i + 1]}'")
+                sys.exit(1)
+            if jobs < 1:
+                print(f"Error: --jobs must be at least 1, got {jobs}")
+                sys.exit(1)
+            i += 2
+        else:
+            words.append(arg)
+            i += 1
+
+    return words, repos, jobs
@@ -7,24 +7,34 @@ Usage: uv run feature.py <your feature description>
 import subprocess
 import sys
 
+import tracing
+from common import PROJECT_ROOT, output_stream
 
-def main():
-    if len(sys.argv) < 2:
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tracing.start("feature.py", argv=argv)
+
+    if not argv:
         print("Usage: uv run feature.py <feature description>")
         print("Example: uv run feature.py 'Add dark mode to homepage'")
         sys.exit(1)
 
     # Join all arguments after the script name into a single feature description
-    feature_input = " ".join(sys.argv[1:])
+    feature_input = " ".join(argv)
 
     # Build the claude command
     claude_command = f'/feature {feature_input}'
 
     # Run claude with the command
     try:
-        result = subprocess.run(
+        result = tracing.run(
             ["claude", "-p", claude_command],
-            cwd="/Users/sbolster/projects/corporate/pyramid-tools",
+            cwd=PROJECT_ROOT,
+            stdout=output_stream(sys.stdout),
+            stderr=output_stream(sys.stderr),
             check=True
         )
         sys.exit(result.returncode)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Warm background server for the adws CLI.
+Usage: adws/adws.py server start    # normally started through the CLI
+
+Listens on a local Unix socket (common.SOCKET_PATH) and runs submitted
+workflows one at a time in this process, so queued jobs share imported
+modules and cached state (configuration, spec index, git branch) instead
+of paying interpreter startup each time. Each job's output is written to
+its own log file under common.RUNTIME_DIR, named after the server start
+time and pid so a restarted server never reuses an old log.
+
+Each job runs in the client's working directory and records a trace when
+the client had ADWS_TRACE set; the server's own environment is not used
+for either. A run request for a different ADWS_PROJECT_ROOT than the
+server's is rejected.
+
+Protocol: the client sends one JSON object per connection and receives one
+JSON object back.
+  {"op": "run", "command": "chore", "argv": [...], "cwd": "...",
+   "project_root": "...", "trace": "/abs/trace.json" or null}
+                                                    -> {"ok": true, "job": {...}}
+  {"op": "status"}                                  -> {"ok": true, "jobs": [...]}
+  {"op": "status", "job": 3}                        -> {"ok": true, "job": {...}}
+  {"op": "stop"}                                    -> {"ok": true}
+Malformed requests get {"ok": false, "error": "..."} and never stop the
+server. A stop request is refused while any job is queued or running, so
+no workflow is ever left running without a server to report on it.
+"""
+
+import importlib
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from datetime import datetime
+
+import tracing
+from common import PROJECT_ROOT, RUNTIME_DIR, SOCKET_PATH, SUBCOMMANDS, check_runtime_dir, open_private, spec_index
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+_queue = queue.Queue()
+_server_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def submit(command, argv, cwd, trace=None):
+    """Queue a workflow and return its job record."""
+    with _jobs_lock:
+        job_id = len(_jobs) + 1
+        job = {
+            "id": job_id,
+            "command": command,
+            "argv": argv,
+            "cwd": cwd,
+            "trace": trace,
+            "state": "queued",
+            "exit_code": None,
+            "log": str(RUNTIME_DIR / f"job_{_server_id}_{job_id}.log"),
+            "submitted": _now(),
+            "started": None,
+            "finished": None,
+        }
+        _jobs[job_id] = job
+    _queue.put(job_id)
+    return dict(job)
+
+
+def run_job(job):
+    """Run one job in this process with its output redirected to the job log."""
+    job["state"] = "running"
+    job["started"] = _now()
+
+    try:
+        log = open_private(job["log"])
+    except OSError as e:
+        job["exit_code"] = 1
+        job["state"] = "failed"
+        job["finished"] = _now()
+        print(f"Error: Could not open job log {job['log']} - {e}")
+        return
+
+    server_cwd = os.getcwd()
+    module_name = SUBCOMMANDS[job["command"]]
+
+    with log, redirect_stdout(log), redirect_stderr(log):
+        tracing.start(f"{module_name}.py", path=job["trace"], argv=job["argv"])
+        with tracing.span(f"job {job['id']}: {job['command']}", "job", argv=job["argv"]):
+            try:
+                os.chdir(job["cwd"])
+                module = importlib.import_module(module_name)
+                module.main(job["argv"])
+                exit_code = 0
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code)
+                    exit_code = 1
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+            finally:
+                os.chdir(server_cwd)
+        tracing.finish()
+
+    job["exit_code"] = exit_code
+    job["state"] = "done" if exit_code == 0 else "failed"
+    job["finished"] = _now()
+
+
+def worker():
+    """Run queued jobs one after another until a None job id arrives."""
+    while True:
+        job_id = _queue.get()
+        if job_id is None:
+            return
+        run_job(_jobs[job_id])
+
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def handle(request):
+    """Handle one client request and return the response."""
+    if not isinstance(request, dict):
+        return {"ok": False, "error": "Request must be a JSON object"}
+
+    op = request.get("op")
+
+    if op == "run":
+        command = request.get("command")
+        if not isinstance(command, str) or command not in SUBCOMMANDS:
+            return {"ok": False, "error": f"Unknown command '{command}'"}
+        argv = request.get("argv", [])
+        if not _is_str_list(argv):
+            return {"ok": False, "error": "argv must be a list of strings"}
+        if not isinstance(request.get("cwd"), str) or not request["cwd"]:
+            return {"ok": False, "error": "Run request is missing cwd"}
+        if not isinstance(request.get("trace"), (str, type(None))):
+            return {"ok": False, "error": "trace must be a path or null"}
+        if request.get("project_root") != str(PROJECT_ROOT):
+            return {
+                "ok": False,
+                "error": f"adws server is running for {PROJECT_ROOT}. "
+                         "Restart it with the new ADWS_PROJECT_ROOT or use --local.",
+            }
+        job = submit(command, argv, request["cwd"], request.get("trace"))
+        return {"ok": True, "job": job}
+
+    if op == "status":
+        with _jobs_lock:
+            if "job" in request:
+                if not isinstance(request["job"], int) or isinstance(request["job"], bool):
+                    return {"ok": False, "error": "Job id must be a number"}
+                job = _jobs.get(request["job"])
+                if job is None:
+                    return {"ok": False, "error": f"No job with id {request['job']}"}
+                return {"ok": True, "job": dict(job)}
+            return {"ok": True, "jobs": [dict(job) for job in _jobs.values()]}
+
+    if op == "stop":
+        with _jobs_lock:
+            busy = [str(job["id"]) for job in _jobs.values() if job["state"] in ("queued", "running")]
+        if busy:
+            return {
+                "ok": False,
+                "error": f"Jobs still queued or running: #{', #'.join(busy)}. "
+                         "Wait for them to finish before stopping the server.",
+            }
+        return {"ok": True}
+
+    return {"ok": False, "error": f"Unknown op '{op}'"}
+
+
+def serve():
+    """Listen on the Unix socket until a stop request arrives."""
+    error = check_runtime_dir()
+    if error:
+        print(f"Error: {error}")
+        sys.exit(1)
+
+    if SOCKET_PATH.exists():
+        SOCKET_PATH.unlink()
+
+    # Jobs trace only when their client asks to, never because the server
+    # was started with ADWS_TRACE set
+    os.environ.pop(tracing.TRACE_ENV, None)
+
+    # Warm the caches and the subcommand modules before accepting jobs
+    spec_index()
+    for module in SUBCOMMANDS.values():
+        importlib.import_module(module)
+
+    worker_thread = threading.Thread(target=worker)
+    worker_thread.start()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(SOCKET_PATH))
+    os.chmod(SOCKET_PATH, 0o600)
+    server.listen()
+    print(f"adws server listening on {SOCKET_PATH} (pid {os.getpid()})")
+    sys.stdout.flush()
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    request = json.loads(conn.makefile().readline())
+                    response = handle(request)
+                except ValueError as e:
+                    request = None
+                    response = {"ok": False, "error": f"Bad request - {e}"}
+                except Exception as e:
+                    traceback.print_exc()
+                    sys.stdout.flush()
+                    request = None
+                    response = {"ok": False, "error": f"Server error - {type(e).__name__}: {e}"}
+                try:
+                    conn.sendall((json.dumps(response) + "\n").encode())
+                except OSError:
+                    pass
+            if isinstance(request, dict) and request.get("op") == "stop" and response["ok"]:
+                break
+    finally:
+        server.close()
+        _queue.put(None)
+        worker_thread.join()
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+        print("adws server stopped")
+
+
+if __name__ == "__main__":
+    serve()
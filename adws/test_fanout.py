@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Checks for the chore.py/bug.py fan-out mode against local repositories.
+Usage: python -m pytest adws/test_fanout.py   (or: python adws/test_fanout.py)
+
+A stub `claude` is put first on PATH. It records each call in the
+repository it runs in, tracks how many copies run at once, and fails in
+any repository that contains a FAIL file.
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+from fanout import fan_out, parse_args
+
+ADWS_DIR = Path(__file__).resolve().parent
+
+STUB_CLAUDE = """#!/bin/sh
+mkdir "$STUB_STATE/running.$$"
+ls -d "$STUB_STATE"/running.* | wc -l >> "$STUB_STATE/concurrency"
+echo "$*" >> calls
+sleep 0.2
+rmdir "$STUB_STATE/running.$$"
+[ -e FAIL ] && exit 3
+exit 0
+"""
+
+STEPS = [
+    (["claude", "-p", "/create-branch chore test"], "Creating chore branch..."),
+    (["claude", "-p", "/chore test"], "Running chore planning and execution..."),
+]
+
+
+class FanOutTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        claude = bin_dir / "claude"
+        claude.write_text(STUB_CLAUDE)
+        claude.chmod(0o755)
+
+        self.state = self.root / "state"
+        self.state.mkdir()
+
+        env = mock.patch.dict(os.environ, {
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "STUB_STATE": str(self.state),
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_repo(self, name, fail=False):
+        repo = self.root / name
+        repo.mkdir()
+        if fail:
+            (repo / "FAIL").touch()
+        return str(repo)
+
+    def run_fan_out(self, repos, jobs=4):
+        with redirect_stdout(io.StringIO()):
+            return fan_out(repos, STEPS, jobs)
+
+    def calls(self, repo):
+        calls = Path(repo) / "calls"
+        return calls.read_text().splitlines() if calls.exists() else []
+
+    def test_results_follow_given_order(self):
+        repos = [self.make_repo(name) for name in ("c", "a", "b")]
+        results = self.run_fan_out(repos)
+        self.assertEqual([result["repo"] for result in results], repos)
+        self.assertTrue(all(result["success"] for result in results))
+
+    def test_concurrency_is_bounded(self):
+        repos = [self.make_repo(f"r{i}") for i in range(5)]
+        self.run_fan_out(repos, jobs=2)
+        counts = [int(line) for line in (self.state / "concurrency").read_text().split()]
+        self.assertLessEqual(max(counts), 2)
+        self.assertEqual(len(counts), 10)
+
+    def test_duplicate_repos_run_once(self):
+        repo = self.make_repo("r1")
+        results = self.run_fan_out([repo, repo])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(len(self.calls(repo)), 2)
+
+    def test_missing_path_fails_without_running(self):
+        results = self.run_fan_out([str(self.root / "missing")])
+        self.assertFalse(results[0]["success"])
+        self.assertEqual(results[0]["failed_step"], "Checking repository path...")
+
+    def test_stops_at_first_failing_step(self):
+        repo = self.make_repo("bad", fail=True)
+        results = self.run_fan_out([repo])
+        self.assertFalse(results[0]["success"])
+        self.assertEqual(results[0]["failed_step"], "Creating chore branch...")
+        self.assertEqual(self.calls(repo), ["-p /create-branch chore test"])
+
+    def test_unrunnable_command_is_a_repo_failure(self):
+        claude = self.root / "bin" / "claude"
+        claude.chmod(0o644)
+        repos = [self.make_repo("r1"), self.make_repo("r2")]
+        with redirect_stdout(io.StringIO()):
+            results = fan_out(repos, [([str(claude)], "Running claude...")])
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any(result["success"] for result in results))
+        self.assertIn("Could not run command", results[0]["output"][-2])
+
+    def test_chore_exits_nonzero_when_a_repo_fails(self):
+        good = self.make_repo("good")
+        bad = self.make_repo("bad", fail=True)
+        result = subprocess.run(
+            [sys.executable, str(ADWS_DIR / "chore.py"), "--repo", good, "--repo", bad, "test"],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("1/2 repositories succeeded", result.stdout)
+        self.assertEqual(len(self.calls(good)), 2)
+
+
+class ParseArgsTest(unittest.TestCase):
+    def parse(self, argv):
+        with redirect_stdout(io.StringIO()):
+            return parse_args(argv)
+
+    def test_splits_options_from_description(self):
+        words, repos, jobs = self.parse(["fix", "--repo", "/tmp", "fonts", "--jobs", "2"])
+        self.assertEqual(words, ["fix", "fonts"])
+        self.assertEqual(repos, [os.path.realpath("/tmp")])
+        self.assertEqual(jobs, 2)
+
+    def test_deduplicates_repos(self):
+        _, repos, _ = self.parse(["--repo", "/tmp", "--repo", "/tmp/", "x"])
+        self.assertEqual(repos, [os.path.realpath("/tmp")])
+
+    def test_rejects_missing_values(self):
+        for argv in (["fix", "fonts", "--repo"], ["fix", "--jobs"]):
+            with self.assertRaises(SystemExit) as e:
+                self.parse(argv)
+            self.assertEqual(e.exception.code, 1)
+
+    def test_rejects_jobs_below_one(self):
+        with self.assertRaises(SystemExit) as e:
+            self.parse(["--jobs", "0", "x"])
+        self.assertEqual(e.exception.code, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
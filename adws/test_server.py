@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Checks for the adws CLI and its warm server against a local project.
+Usage: python -m pytest adws/test_server.py   (or: python adws/test_server.py)
+
+A server is started on a temporary ADWS_RUNTIME_DIR and ADWS_PROJECT_ROOT
+with a stub `claude` first on PATH. The stub appends "<cwd> <args>" to a
+calls file, sleeps if a `sleep` file exists and exits with the code in an
+`exit` file if one exists.
+"""
+
+import json
+import os
+import re
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ADWS = Path(__file__).resolve().with_name("adws.py")
+
+STUB_CLAUDE = """#!/bin/sh
+echo "$PWD $*" >> "$STUB_STATE/calls"
+[ -e "$STUB_STATE/sleep" ] && sleep 1
+[ -e "$STUB_STATE/exit" ] && exit "$(cat "$STUB_STATE/exit")"
+echo ok
+"""
+
+
+class ServerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        claude = bin_dir / "claude"
+        claude.write_text(STUB_CLAUDE)
+        claude.chmod(0o755)
+
+        cls.state = root / "state"
+        cls.project = root / "project"
+        cls.work = root / "work"
+        cls.runtime = root / "runtime"
+        for path in (cls.state, cls.project / "specs", cls.work / "repo"):
+            path.mkdir(parents=True)
+
+        cls.env = dict(
+            os.environ,
+            PATH=f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            STUB_STATE=str(cls.state),
+            ADWS_PROJECT_ROOT=str(cls.project),
+            ADWS_RUNTIME_DIR=str(cls.runtime),
+        )
+        cls.env.pop("ADWS_TRACE", None)
+        cls.env.pop("ADWS_SOCKET", None)
+
+        result = cls.adws("server", "start")
+        if result.returncode != 0:
+            cls.tmp.cleanup()
+            raise RuntimeError(f"adws server did not start:\n{result.stdout}")
+
+    @classmethod
+    def tearDownClass(cls):
+        (cls.state / "sleep").unlink(missing_ok=True)
+        if cls.adws("server", "stop").returncode != 0:
+            match = re.search(r"\(pid (\d+)\)", (cls.runtime / "server.log").read_text())
+            if match:
+                os.kill(int(match.group(1)), signal.SIGTERM)
+        cls.tmp.cleanup()
+
+    @classmethod
+    def adws(cls, *args, env=None):
+        return subprocess.run(
+            [sys.executable, str(ADWS), *args],
+            cwd=cls.work,
+            env=env or cls.env,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+
+    def setUp(self):
+        for name in ("calls", "exit", "sleep"):
+            (self.state / name).unlink(missing_ok=True)
+
+    def send(self, payload):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(str(self.runtime / "adws.sock"))
+            conn.sendall(payload)
+            return json.loads(conn.makefile().readline())
+
+    def calls(self):
+        calls = self.state / "calls"
+        return calls.read_text().splitlines() if calls.exists() else []
+
+    def test_status_lists_jobs(self):
+        self.adws("--wait", "chore", "tidy")
+        result = self.adws("status")
+        self.assertEqual(result.returncode, 0)
+        self.assertIn("done", result.stdout)
+        self.assertIn("chore tidy", result.stdout)
+
+    def test_wait_returns_job_exit_code(self):
+        result = self.adws("--wait", "chore", "tidy")
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn("Chore complete!", result.stdout)
+
+        (self.state / "exit").write_text("5")
+        result = self.adws("--wait", "feature", "dark mode")
+        self.assertEqual(result.returncode, 5, result.stdout)
+        self.assertIn("failed (exit 5)", result.stdout)
+
+    def test_job_runs_in_client_cwd(self):
+        result = self.adws("--wait", "chore", "--repo", "repo", "tidy")
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertTrue(all(call.startswith(f"{self.work / 'repo'} ") for call in self.calls()))
+        self.assertEqual(len(self.calls()), 2)
+
+    def test_job_writes_client_trace(self):
+        env = dict(self.env, ADWS_TRACE="trace.json")
+        result = self.adws("--wait", "implement", "specs/001.md", env=env)
+        self.assertEqual(result.returncode, 0, result.stdout)
+
+        events = json.loads((self.work / "trace.json").read_text())["traceEvents"]
+        (root,) = [event for event in events if event.get("cat") == "run"]
+        self.assertEqual(root["args"]["argv"], ["specs/001.md"])
+        (claude,) = [event for event in events if event.get("cat") == "subprocess"]
+        self.assertEqual(claude["args"]["exit_code"], 0)
+        self.assertEqual(claude["args"]["output_bytes"], 3)
+
+    def test_rejects_other_project_root(self):
+        env = dict(self.env, ADWS_PROJECT_ROOT=str(self.work))
+        result = self.adws("chore", "tidy", env=env)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("adws server is running for", result.stdout)
+        self.assertEqual(self.calls(), [])
+
+    def test_rejects_usage_errors_before_queueing(self):
+        for args in (["chore"], ["bug", "fix", "--repo"]):
+            result = self.adws(*args)
+            self.assertEqual(result.returncode, 1)
+            self.assertNotIn("Queued job", result.stdout)
+
+    def test_runtime_dir_and_logs_are_private(self):
+        self.adws("--wait", "chore", "tidy")
+        self.assertEqual(stat.S_IMODE(self.runtime.stat().st_mode), 0o700)
+        logs = list(self.runtime.glob("job_*.log"))
+        self.assertTrue(logs)
+        for log in logs:
+            self.assertEqual(stat.S_IMODE(log.stat().st_mode), 0o600)
+
+    def test_malformed_requests_do_not_stop_server(self):
+        for payload in (
+            b'{"op": "status", "job": [1]}\n',
+            b'{"op": "run", "command": "chore", "argv": "tidy", "cwd": "/"}\n',
+            b'[1]\n',
+            b'not json\n',
+        ):
+            self.assertFalse(self.send(payload)["ok"])
+        self.assertTrue(self.send(b'{"op": "status"}\n')["ok"])
+
+    def test_stop_refused_while_job_running(self):
+        (self.state / "sleep").touch()
+        queued = self.adws("chore", "slow")
+        job_id = re.search(r"Queued job #(\d+)", queued.stdout).group(1)
+
+        result = self.adws("server", "stop")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("still queued or running", result.stdout)
+
+        result = self.adws("status", job_id, "--wait")
+        self.assertEqual(result.returncode, 0, result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
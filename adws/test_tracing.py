@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Checks for the Chrome trace export in tracing.py.
+Usage: python -m pytest adws/test_tracing.py   (or: python adws/test_tracing.py)
+
+Commands are small `sh -c` scripts so output sizes and exit codes are known.
+"""
+
+import io
+import json
+import subprocess
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import tracing
+
+SCRIPT = "printf abc; printf de >&2; exit {code}"
+
+
+def sh(code=0):
+    return ["sh", "-c", SCRIPT.format(code=code)]
+
+
+class TracingTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.trace_file = Path(self.tmp.name) / "trace.json"
+        self.addCleanup(self.finish)
+
+    def start(self, argv=None):
+        tracing.start("test.py", path=str(self.trace_file), argv=argv or [])
+
+    def finish(self):
+        with redirect_stdout(io.StringIO()):
+            tracing.finish()
+
+    def events(self, cat=None):
+        events = json.loads(self.trace_file.read_text())["traceEvents"]
+        return [event for event in events if cat is None or event.get("cat") == cat]
+
+    def test_run_streamed_counts_and_passes_output_through(self):
+        out, err = io.StringIO(), io.StringIO()
+        result, output_bytes = tracing._run_streamed(sh(), out, err)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(output_bytes, 5)
+        self.assertEqual(out.getvalue(), "abc")
+        self.assertEqual(err.getvalue(), "de")
+
+    def test_run_streamed_writes_bytes_to_binary_buffer(self):
+        out = io.TextIOWrapper(io.BytesIO())
+        result, output_bytes = tracing._run_streamed(sh(), out, io.StringIO())
+        self.assertEqual(output_bytes, 5)
+        self.assertEqual(out.buffer.getvalue(), b"abc")
+
+    def test_streamed_span_records_exit_code_and_bytes(self):
+        self.start()
+        out, err = io.StringIO(), io.StringIO()
+        result = tracing.run(sh(), stdout=out, stderr=err)
+        self.assertEqual(result.returncode, 0)
+        self.finish()
+
+        (event,) = self.events("subprocess")
+        self.assertEqual(event["args"]["exit_code"], 0)
+        self.assertEqual(event["args"]["output_bytes"], 5)
+        self.assertEqual(out.getvalue(), "abc")
+
+    def test_streamed_called_process_error_is_recorded(self):
+        self.start()
+        with self.assertRaises(subprocess.CalledProcessError) as e:
+            tracing.run(sh(4), stdout=io.StringIO(), stderr=io.StringIO(), check=True)
+        self.assertEqual(e.exception.returncode, 4)
+        self.finish()
+
+        (event,) = self.events("subprocess")
+        self.assertEqual(event["args"]["exit_code"], 4)
+        self.assertEqual(event["args"]["output_bytes"], 5)
+        self.assertIn("CalledProcessError", event["args"]["error"])
+
+    def test_captured_called_process_error_is_recorded(self):
+        self.start()
+        with self.assertRaises(subprocess.CalledProcessError) as e:
+            tracing.run(sh(3), capture_output=True, text=True, check=True)
+        self.assertEqual(e.exception.stdout, "abc")
+        self.finish()
+
+        (event,) = self.events("subprocess")
+        self.assertEqual(event["args"]["exit_code"], 3)
+        self.assertEqual(event["args"]["output_bytes"], 5)
+
+    def test_finish_writes_trace_and_resets(self):
+        self.start(argv=["tidy"])
+        with tracing.span("stage one"):
+            pass
+        self.finish()
+
+        self.assertFalse(tracing.enabled())
+        events = self.events()
+        names = {event["name"] for event in events}
+        self.assertEqual(names, {"process_name", "stage one", "test.py"})
+        (root,) = self.events("run")
+        self.assertEqual(root["args"]["argv"], ["tidy"])
+        for event in events:
+            self.assertIn(event["ph"], ("M", "X"))
+            if event["ph"] == "X":
+                self.assertGreaterEqual(event["dur"], 0)
+
+        # A second trace starts empty and finishing twice is harmless
+        self.start()
+        self.finish()
+        self.finish()
+        self.assertEqual({event["name"] for event in self.events()}, {"process_name", "test.py"})
+
+    def test_disabled_run_records_nothing(self):
+        result = tracing.run(sh(), capture_output=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertFalse(tracing.enabled())
+        self.assertEqual(tracing._events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
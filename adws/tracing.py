@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Optional Chrome Trace Event / Perfetto timeline export for adws scripts.
+
+Set ADWS_TRACE to a file path to record a trace of the run:
+
+  ADWS_TRACE=trace.json uv run adws/build_feature.py 'Add dark mode toggle'
+
+The file can be opened in chrome://tracing or https://ui.perfetto.dev.
+It contains one span for the whole script, one per stage (each
+run_command call), one per claude/git/gh subprocess with its arguments,
+exit code and output size, and spans for orchestrator work such as spec
+extraction, spec lookup and log writing. When ADWS_TRACE is not set every
+helper here is a cheap no-op.
+"""
+
+import atexit
+import functools
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+TRACE_ENV = "ADWS_TRACE"
+
+_events = []
+_lock = threading.Lock()
+_trace_path = None
+_root = None
+_origin_ns = time.perf_counter_ns()
+
+
+def enabled():
+    """Return True if a trace is being recorded for this run."""
+    return _trace_path is not None
+
+
+def _now_us():
+    return (time.perf_counter_ns() - _origin_ns) / 1000
+
+
+def _record(event):
+    with _lock:
+        _events.append(event)
+
+
+def start(name, path=None, argv=None):
+    """Start tracing this script run if ADWS_TRACE (or path) is set.
+
+    Records a root span named after the script that ends when finish() is
+    called or the process exits, and writes the trace file then.
+    """
+    global _trace_path, _root
+
+    path = path or os.environ.get(TRACE_ENV)
+    if not path or _trace_path is not None:
+        return
+
+    _trace_path = Path(path).expanduser().resolve()
+    _root = {
+        "name": name,
+        "ts": _now_us(),
+        "tid": threading.get_ident(),
+        "argv": sys.argv[1:] if argv is None else argv,
+    }
+    _record({
+        "name": "process_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": {"name": f"adws {name}"},
+    })
+    atexit.register(finish)
+
+
+def finish():
+    """Close the root span, write the trace file and stop tracing."""
+    global _trace_path, _root
+
+    if _trace_path is None:
+        return
+
+    _record({
+        "name": _root["name"],
+        "cat": "run",
+        "ph": "X",
+        "ts": _root["ts"],
+        "dur": _now_us() - _root["ts"],
+        "pid": os.getpid(),
+        "tid": _root["tid"],
+        "args": {"argv": _root["argv"]},
+    })
+
+    with _lock:
+        events = sorted(_events, key=lambda event: event.get("ts", 0))
+        _events.clear()
+    trace_path, _trace_path, _root = _trace_path, None, None
+
+    try:
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        trace_path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        print(f"Trace saved to: {trace_path}")
+    except OSError as e:
+        print(f"Error: Could not write trace file - {e}")
+
+
+@contextmanager
+def span(name, cat="stage", **args):
+    """Record a complete span around the enclosed block.
+
+    Yields the span's args dict so callers can attach results (exit codes,
+    byte counts) before the block ends.
+    """
+    if not enabled():
+        yield args
+        return
+
+    ts = _now_us()
+    try:
+        yield args
+    except BaseException as e:
+        args.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _record({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": ts,
+            "dur": _now_us() - ts,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        })
+
+
+def traced(cat="orchestrator"):
+    """Decorator that records a span for every call to the function."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(func.__name__, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _output_bytes(*streams):
+    total = 0
+    for stream in streams:
+        if isinstance(stream, str):
+            total += len(stream.encode())
+        elif isinstance(stream, bytes):
+            total += len(stream)
+    return total
+
+
+def _stream_target(value, default):
+    """Return the file object a streamed child's output should be copied to.
+
+    Returns None when the caller asked for a pipe, DEVNULL or a raw file
+    descriptor, which we leave to subprocess.
+    """
+    if value is None:
+        return default
+    if hasattr(value, "write"):
+        return value
+    return None
+
+
+def _tee(source, dest, counts, index):
+    """Copy a child's output to dest as it arrives, counting the bytes."""
+    dest.flush()
+    target = getattr(dest, "buffer", None)
+    for chunk in iter(lambda: source.read1(65536), b""):
+        counts[index] += len(chunk)
+        if target is not None:
+            target.write(chunk)
+            target.flush()
+        else:
+            dest.write(chunk.decode(errors="replace"))
+            dest.flush()
+    source.close()
+
+
+def _run_streamed(command, stdout, stderr, check=False, **kwargs):
+    """Run a command whose output goes to stdout/stderr, returning (result, output_bytes)."""
+    for key in ("text", "universal_newlines", "encoding", "errors"):
+        kwargs.pop(key, None)
+
+    counts = [0, 0]
+    with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs) as proc:
+        threads = [
+            threading.Thread(target=_tee, args=(proc.stdout, stdout, counts, 0)),
+            threading.Thread(target=_tee, args=(proc.stderr, stderr, counts, 1)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        returncode = proc.wait()
+
+    if check and returncode != 0:
+        error = subprocess.CalledProcessError(returncode, command)
+        error.output_bytes = sum(counts)
+        raise error
+    return subprocess.CompletedProcess(command, returncode), sum(counts)
+
+
+def run(command, **kwargs):
+    """subprocess.run with a span recording the command, exit code and output size.
+
+    When tracing is on, output that would go straight to the terminal (or
+    to a file object passed as stdout/stderr) is piped through us and
+    copied on as it arrives, so its size can be recorded too.
+    """
+    name = command[0] if isinstance(command, (list, tuple)) else str(command).split()[0]
+    cwd = kwargs.get("cwd")
+
+    with span(name, "subprocess", command=list(command), cwd=str(cwd) if cwd else None) as args:
+        stdout = _stream_target(kwargs.get("stdout"), sys.stdout)
+        stderr = _stream_target(kwargs.get("stderr"), sys.stderr)
+        streamed = (
+            enabled()
+            and stdout is not None
+            and stderr is not None
+            and not kwargs.get("capture_output")
+            and "input" not in kwargs
+            and "timeout" not in kwargs
+        )
+
+        try:
+            if streamed:
+                kwargs.pop("stdout", None)
+                kwargs.pop("stderr", None)
+                result, output_bytes = _run_streamed(command, stdout, stderr, **kwargs)
+                args["exit_code"] = result.returncode
+                args["output_bytes"] = output_bytes
+                return result
+
+            result = subprocess.run(command, **kwargs)
+        except subprocess.CalledProcessError as e:
+            args["exit_code"] = e.returncode
+            if streamed:
+                args["output_bytes"] = e.output_bytes
+            else:
+                args["output_bytes"] = _output_bytes(e.stdout, e.stderr) if e.stdout is not None else None
+            raise
+
+        args["exit_code"] = result.returncode
+        args["output_bytes"] = _output_bytes(result.stdout, result.stderr) if result.stdout is not None else None
+        return result